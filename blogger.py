@@ -1,29 +1,54 @@
 import os
-import requests
-import json
+import io
+import asyncio
+import orjson
 import logging
+import queue
+import atexit
+from logging.handlers import QueueHandler, QueueListener
+import aiohttp
 from datetime import datetime
-from typing import TypedDict, List, Optional, Dict, Any
+from dataclasses import dataclass, field
+from typing import TypedDict, List, Optional, Dict, Any, Sequence, AsyncIterator
 import operator
 from dotenv import load_dotenv
 from langchain_groq import ChatGroq
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 from pathlib import Path
+from collections import OrderedDict
+from types import SimpleNamespace
 import time
 import re
 import hashlib
+import functools
+import shelve
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('blogging_agent.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging: records are queued and written by a background
+# listener thread so logging calls on the hot path never block on I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('blogging_agent.log'), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logging.getLogger().addHandler(QueueHandler(_log_queue))
+logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns used on the content analysis and save paths
+_SENT_RE = re.compile(r'[.!?]+')
+_H2_RE = re.compile(r'^##\s', re.MULTILINE)
+_HEADER_RE = re.compile(r'^#+\s(.+)', re.MULTILINE)
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_SLUG_DASH = re.compile(r'[-\s]+')
+_NUM_PREFIX = re.compile(r'^\d+\.')
+_JSON_OBJECT = re.compile(r'\{.*\}', re.DOTALL)
+
 # --- 1. Enhanced State Definition ---
 class BloggingState(TypedDict):
     # Topic-related
@@ -45,13 +70,14 @@ class BloggingState(TypedDict):
     title_suggestions: List[str]
     
     # Quality metrics
-    seo_score: int
+    seo_score: Optional[int]
     readability_score: int
     content_quality_score: int
     
     # Workflow control
     user_feedback: str
     is_complete: bool
+    all_in_one_failed: bool
     generation_attempts: int
     errors: List[str]
     
@@ -61,68 +87,279 @@ class BloggingState(TypedDict):
     estimated_read_time: int
 
 # --- 2. Enhanced Configuration ---
+_ENV_LOADED = load_dotenv()
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+# Config field -> (environment variable, default, parser)
+_CONFIG_ENV = {
+    # Model settings
+    "model_name": ("MODEL_NAME", "llama3-70b-8192", str),
+    "temperature": ("TEMPERATURE", "0.7", float),
+    "max_tokens": ("MAX_TOKENS", "4000", int),
+    
+    # Content settings
+    "min_word_count": ("MIN_WORD_COUNT", "300", int),
+    "max_word_count": ("MAX_WORD_COUNT", "3000", int),
+    "max_generation_attempts": ("MAX_GENERATION_ATTEMPTS", "3", int),
+    
+    # Reddit API settings
+    "reddit_user_agent": ("REDDIT_USER_AGENT", "BloggingAgent/2.0", str),
+    "reddit_timeout": ("REDDIT_TIMEOUT", "10", int),
+    
+    # LLM cache settings
+    "cache_deterministic": ("CACHE_DETERMINISTIC", "true", _parse_bool),
+    "llm_cache_path": ("LLM_CACHE_PATH", ".llm_cache", str),
+    "llm_cache_size": ("LLM_CACHE_SIZE", "256", int),
+}
+
+@dataclass(frozen=True, slots=True)
 class BloggingConfig:
-    def __init__(self):
-        load_dotenv()
-        
-        # API Configuration
-        self.groq_api_key = os.getenv("GROQ_API_KEY")
-        if not self.groq_api_key:
+    groq_api_key: str = field(repr=False)  # keep the secret out of logs
+    model_name: str
+    temperature: float
+    max_tokens: int
+    min_word_count: int
+    max_word_count: int
+    max_generation_attempts: int
+    reddit_user_agent: str
+    reddit_timeout: int
+    cache_deterministic: bool
+    llm_cache_path: str
+    llm_cache_size: int
+    
+    @classmethod
+    def from_env(cls) -> "BloggingConfig":
+        """Build the configuration from environment variables."""
+        groq_api_key = os.getenv("GROQ_API_KEY")
+        if not groq_api_key:
             raise ValueError("GROQ_API_KEY not found in environment variables")
         
-        # Model settings
-        self.model_name = os.getenv("MODEL_NAME", "llama3-70b-8192")
-        self.temperature = float(os.getenv("TEMPERATURE", "0.7"))
-        self.max_tokens = int(os.getenv("MAX_TOKENS", "4000"))
-        
-        # Content settings
-        self.min_word_count = int(os.getenv("MIN_WORD_COUNT", "300"))
-        self.max_word_count = int(os.getenv("MAX_WORD_COUNT", "3000"))
-        self.max_generation_attempts = int(os.getenv("MAX_GENERATION_ATTEMPTS", "3"))
-        
-        # Reddit API settings
-        self.reddit_user_agent = os.getenv("REDDIT_USER_AGENT", "BloggingAgent/2.0")
-        self.reddit_timeout = int(os.getenv("REDDIT_TIMEOUT", "10"))
+        return cls(
+            groq_api_key=groq_api_key,
+            **{attr: parse(os.getenv(name, default)) for attr, (name, default, parse) in _CONFIG_ENV.items()}
+        )
+
+_CONFIG: Optional[BloggingConfig] = None
+
+def get_config() -> BloggingConfig:
+    """Return the process-wide configuration, loading it on first use."""
+    global _CONFIG
+    if _CONFIG is None:
+        _CONFIG = BloggingConfig.from_env()
+    return _CONFIG
+
+# --- 3. LLM Response Cache ---
+class LLMCache:
+    """Exact-match response cache in front of the chat model.
+
+    Only deterministic (temperature 0) calls are cached. With
+    `cache_deterministic` enabled, cached calls go through a second
+    temperature-0 client while fresh calls keep the configured temperature.
+    """
+
+    def __init__(self, llm: ChatGroq, config: BloggingConfig):
+        self.llm = llm
+        self.enabled = config.cache_deterministic or config.temperature == 0
+
+        if config.cache_deterministic and config.temperature != 0:
+            self.deterministic_llm = ChatGroq(
+                temperature=0,
+                model_name=config.model_name,
+                max_tokens=config.max_tokens
+            )
+        else:
+            self.deterministic_llm = llm
+
+        self.model_name = config.model_name
+        self.path = config.llm_cache_path
+        self.maxsize = config.llm_cache_size
+        self._memory = OrderedDict()  # L1: in-process LRU
+
+    def _key(self, prompt: str, **kwargs) -> str:
+        payload = {"model": self.model_name, "temperature": 0, "prompt": prompt}
+        if kwargs:
+            payload["kwargs"] = kwargs
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def _remember(self, key: str, value: str):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response, memory first, then disk."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        try:
+            with shelve.open(self.path) as db:
+                value = db.get(key)
+        except Exception as e:
+            logger.warning(f"Could not read LLM cache: {e}")
+            return None
+
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: str):
+        """Store a response in memory and on disk."""
+        self._remember(key, value)
+        try:
+            with shelve.open(self.path) as db:
+                db[key] = value
+        except Exception as e:
+            logger.warning(f"Could not write LLM cache: {e}")
+
+    async def astream(self, prompt: str, fresh: bool = False) -> AsyncIterator[Any]:
+        """Stream the response chunk by chunk; a cache hit arrives as one chunk."""
+        if fresh or not self.enabled:
+            async for chunk in self.llm.astream(prompt):
+                yield chunk
+            return
+
+        key = self._key(prompt)
+        cached = self.get(key)
+        if cached is not None:
+            logger.info("LLM cache hit")
+            yield SimpleNamespace(content=cached)
+            return
+
+        parts = []
+        async for chunk in self.deterministic_llm.astream(prompt):
+            parts.append(chunk.content)
+            yield chunk
+
+        # Only complete responses are cached
+        self.set(key, "".join(parts))
+
+    async def ainvoke(self, prompt: str, fresh: bool = False, **kwargs):
+        """Invoke the model, serving repeated prompts from the cache.
+
+        `fresh=True` skips the cache and samples at the configured temperature,
+        e.g. when the user explicitly asks for new content. Extra kwargs
+        (e.g. `response_format`) are passed to the model.
+        """
+        if fresh or not self.enabled:
+            return await self.llm.ainvoke(prompt, **kwargs)
 
-# --- 3. Enhanced Data Sources ---
+        key = self._key(prompt, **kwargs)
+        cached = self.get(key)
+        if cached is not None:
+            logger.info("LLM cache hit")
+            return SimpleNamespace(content=cached)
+
+        response = await self.deterministic_llm.ainvoke(prompt, **kwargs)
+        self.set(key, response.content)
+        return response
+
+
+# --- 4. Enhanced Data Sources ---
 class TopicFetcher:
+    # Retry policy for transient Reddit gateway errors
+    RETRY_TOTAL = 2
+    RETRY_BACKOFF = 0.3
+    RETRY_STATUSES = frozenset({502, 503, 504})
+    
     def __init__(self, config: BloggingConfig):
         self.config = config
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300),
+                headers={'User-Agent': self.config.reddit_user_agent},
+                timeout=aiohttp.ClientTimeout(total=self.config.reddit_timeout)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the pooled HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+    
+    def shutdown(self):
+        """Close the pooled session and the loop used by the sync wrapper."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.close())
+            self._loop.close()
+    
+    async def _fetch_subreddit_posts(self, subreddit: str, limit: int) -> List[dict]:
+        url = f'https://www.reddit.com/r/{subreddit}/hot.json?limit={limit}'
         
-    def fetch_reddit_topics(self, subreddit: str = "all", limit: int = 25) -> List[dict]:
-        """Fetch trending topics from Reddit with enhanced filtering."""
+        for attempt in range(self.RETRY_TOTAL + 1):
+            async with self._get_session().get(url) as response:
+                if response.status in self.RETRY_STATUSES and attempt < self.RETRY_TOTAL:
+                    await asyncio.sleep(self.RETRY_BACKOFF * 2 ** attempt)
+                    continue
+                
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
+                return [post['data'] for post in data['data']['children']]
+    
+    async def fetch_reddit_topics(self, subreddits: Sequence[str] = ("all", "technology", "science"), limit: int = 25) -> List[dict]:
+        """Fetch trending topics from several subreddits concurrently with enhanced filtering."""
         try:
-            logger.info(f"Fetching topics from r/{subreddit}")
+            logger.info(f"Fetching topics from {', '.join('r/' + s for s in subreddits)}")
             
-            url = f'https://www.reddit.com/r/{subreddit}/hot.json?limit={limit}'
-            headers = {'User-Agent': self.config.reddit_user_agent}
+            results = await asyncio.gather(
+                *(self._fetch_subreddit_posts(subreddit, limit) for subreddit in subreddits),
+                return_exceptions=True
+            )
             
-            response = requests.get(url, headers=headers, timeout=self.config.reddit_timeout)
-            response.raise_for_status()
+            # Merge and dedup posts across subreddits
+            posts = []
+            seen_titles = set()
+            failures = []
+            for subreddit, result in zip(subreddits, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Error fetching r/{subreddit}: {result}")
+                    failures.append(result)
+                    continue
+                
+                for post_data in result:
+                    title_key = post_data['title'].lower()
+                    if title_key not in seen_titles:
+                        seen_titles.add(title_key)
+                        posts.append(post_data)
+            
+            if len(failures) == len(subreddits):
+                raise failures[0]
             
-            data = response.json()
             topics = []
             
-            for post in data['data']['children']:
-                post_data = post['data']
+            for post_data in posts:
+                title = post_data['title']
+                score = post_data['score']
+                title_len = len(title)
                 
-                # Enhanced filtering
-                if (post_data['score'] > 1000 and 
+                # Enhanced filtering, cheapest check first
+                if (score > 1000 and 
                     not post_data['over_18'] and 
-                    len(post_data['title']) < 200 and
-                    len(post_data['title']) > 10 and
+                    10 < title_len < 200 and
                     not post_data.get('stickied', False)):
                     
+                    selftext = post_data.get('selftext', '')
                     topics.append({
-                        'title': post_data['title'],
-                        'score': post_data['score'],
+                        'title': title,
+                        'score': score,
                         'num_comments': post_data['num_comments'],
                         'subreddit': post_data['subreddit'],
                         'created_utc': post_data['created_utc'],
                         'url': post_data.get('url', ''),
-                        'selftext': post_data.get('selftext', '')[:200] + '...' if post_data.get('selftext') else ''
+                        'selftext': selftext[:200] + '...' if selftext else ''
                     })
             
+            # Several hot lists are merged, so rank them by score
+            topics.sort(key=lambda topic: topic['score'], reverse=True)
+            
             logger.info(f"Successfully fetched {len(topics)} topics")
             return topics[:15]  # Return top 15
             
@@ -130,6 +367,16 @@ class TopicFetcher:
             logger.error(f"Error fetching Reddit topics: {e}")
             return self._get_fallback_topics()
     
+    def fetch_reddit_topics_sync(self, *args, **kwargs) -> List[dict]:
+        """Blocking wrapper around `fetch_reddit_topics` for synchronous callers.
+        
+        Runs on an event loop owned by the fetcher so the pooled session and
+        its keep-alive connections survive between calls.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.fetch_reddit_topics(*args, **kwargs))
+    
     def _get_fallback_topics(self) -> List[dict]:
         """Fallback topics if API fails."""
         return [
@@ -140,18 +387,48 @@ class TopicFetcher:
             {'title': 'Mental Health in the Digital Age', 'score': 3500, 'num_comments': 190, 'subreddit': 'psychology'}
         ]
 
-# --- 4. Content Quality Analyzer ---
+@functools.lru_cache(maxsize=None)
+def get_topic_fetcher(config: BloggingConfig) -> TopicFetcher:
+    """Return the shared TopicFetcher for a config."""
+    return TopicFetcher(config)
+
+# --- 5. Content Quality Analyzer ---
 class ContentAnalyzer:
+    @staticmethod
+    def analyze(content: str, topic: str, keywords: List[str], outline: str) -> dict:
+        """Calculate all quality scores from one set of content statistics."""
+        content_lower = content.lower()
+        word_count = len(content.split())
+        sentence_count = len(_SENT_RE.findall(content))
+        header_count = len(_HEADER_RE.findall(content))
+        
+        return {
+            "seo": ContentAnalyzer._seo_score(content, content_lower, word_count, topic, keywords),
+            "readability": ContentAnalyzer._readability_score(word_count, sentence_count),
+            "quality": ContentAnalyzer._quality_score(content, content_lower, header_count, outline)
+        }
+    
     @staticmethod
     def calculate_readability_score(text: str) -> int:
         """Calculate a simple readability score."""
-        sentences = len(re.findall(r'[.!?]+', text))
-        words = len(text.split())
-        
-        if sentences == 0:
+        return ContentAnalyzer._readability_score(len(text.split()), len(_SENT_RE.findall(text)))
+    
+    @staticmethod
+    def calculate_seo_score(content: str, topic: str, keywords: List[str]) -> int:
+        """Enhanced SEO scoring."""
+        return ContentAnalyzer._seo_score(content, content.lower(), len(content.split()), topic, keywords)
+    
+    @staticmethod
+    def calculate_content_quality_score(content: str, outline: str) -> int:
+        """Calculate content quality based on structure and completeness."""
+        return ContentAnalyzer._quality_score(content, content.lower(), len(_HEADER_RE.findall(content)), outline)
+    
+    @staticmethod
+    def _readability_score(word_count: int, sentence_count: int) -> int:
+        if sentence_count == 0:
             return 0
         
-        avg_sentence_length = words / sentences
+        avg_sentence_length = word_count / sentence_count
         
         # Simple scoring: penalize very long sentences
         if avg_sentence_length < 15:
@@ -164,8 +441,7 @@ class ContentAnalyzer:
             return 50
     
     @staticmethod
-    def calculate_seo_score(content: str, topic: str, keywords: List[str]) -> int:
-        """Enhanced SEO scoring."""
+    def _seo_score(content: str, content_lower: str, word_count: int, topic: str, keywords: List[str]) -> int:
         score = 60  # Base score
         
         # Check for title (H1)
@@ -173,46 +449,53 @@ class ContentAnalyzer:
             score += 15
         
         # Word count optimization
-        word_count = len(content.split())
         if 500 <= word_count <= 2000:
             score += 20
         elif word_count < 300:
             score -= 20
         
         # Keyword density check
-        content_lower = content.lower()
-        topic_lower = topic.lower()
-        
-        if topic_lower in content_lower:
+        if topic.lower() in content_lower:
             score += 10
         
         # Check for keywords
-        keyword_count = sum(1 for keyword in keywords if keyword.lower() in content_lower)
+        keyword_count = ContentAnalyzer._count_keywords(content_lower, keywords)
         score += min(keyword_count * 3, 15)
         
         # Check for headers (H2, H3)
-        if re.search(r'^##\s', content, re.MULTILINE):
+        if _H2_RE.search(content):
             score += 10
         
         return min(score, 100)
     
     @staticmethod
-    def calculate_content_quality_score(content: str, outline: str) -> int:
-        """Calculate content quality based on structure and completeness."""
+    def _count_keywords(content_lower: str, keywords: List[str]) -> int:
+        """Count keywords present in the content with a single regex scan."""
+        alternatives = sorted({keyword.lower() for keyword in keywords if keyword}, key=len, reverse=True)
+        if not alternatives:
+            return 0
+        
+        # The lookahead reports the longest keyword starting at every position;
+        # shorter keywords are then found inside those hits.
+        pattern = re.compile("(?=(" + "|".join(map(re.escape, alternatives)) + "))")
+        hits = set(pattern.findall(content_lower))
+        return sum(1 for keyword in keywords if any(keyword.lower() in hit for hit in hits))
+    
+    @staticmethod
+    def _quality_score(content: str, content_lower: str, header_count: int, outline: str) -> int:
         score = 50  # Base score
         
         # Check if content follows outline structure
-        outline_headers = re.findall(r'^#+\s(.+)', outline, re.MULTILINE)
-        content_headers = re.findall(r'^#+\s(.+)', content, re.MULTILINE)
+        outline_headers = _HEADER_RE.findall(outline)
         
-        if len(content_headers) >= len(outline_headers) * 0.7:
+        if header_count >= len(outline_headers) * 0.7:
             score += 20
         
         # Check for introduction and conclusion
-        if "introduction" in content.lower() or content.startswith("# "):
+        if "introduction" in content_lower or content.startswith("# "):
             score += 10
         
-        if "conclusion" in content.lower() or "summary" in content.lower():
+        if "conclusion" in content_lower or "summary" in content_lower:
             score += 10
         
         # Check content depth
@@ -222,16 +505,13 @@ class ContentAnalyzer:
         
         return min(score, 100)
 
-# --- 5. Enhanced Agent Nodes ---
-def fetch_trending_topics_node(state: BloggingState) -> dict:
+# --- 6. Enhanced Agent Nodes ---
+def fetch_trending_topics_node(state: BloggingState, fetcher: TopicFetcher) -> dict:
     """Enhanced topic fetching with multiple sources."""
     logger.info("Fetching trending topics...")
     
-    config = BloggingConfig()
-    fetcher = TopicFetcher(config)
-    
     try:
-        topics = fetcher.fetch_reddit_topics()
+        topics = fetcher.fetch_reddit_topics_sync()
         
         if not topics:
             raise ValueError("No suitable topics found")
@@ -250,7 +530,11 @@ def fetch_trending_topics_node(state: BloggingState) -> dict:
             "errors": [str(e)]
         }
 
-def generate_title_suggestions_node(state: BloggingState, llm: ChatGroq) -> dict:
+def _keywords_str(state: BloggingState) -> str:
+    """Join keywords in a canonical order so reordered keyword lists hit the LLM cache."""
+    return ", ".join(sorted(state.get('keywords', []), key=str.casefold))
+
+async def generate_title_suggestions_node(state: BloggingState, llm: LLMCache) -> dict:
     """Generate multiple title suggestions for the selected topic."""
     logger.info("Generating title suggestions...")
     
@@ -272,21 +556,21 @@ def generate_title_suggestions_node(state: BloggingState, llm: ChatGroq) -> dict
     """
     
     try:
-        response = llm.invoke(prompt)
-        titles = [line.strip() for line in response.content.split('\n') if line.strip() and re.match(r'^\d+\.', line.strip())]
+        response = await llm.ainvoke(prompt)
+        titles = [line.strip() for line in response.content.split('\n') if line.strip() and _NUM_PREFIX.match(line.strip())]
         
         logger.info("Title suggestions generated successfully")
         return {"title_suggestions": titles}
         
     except Exception as e:
         logger.error(f"Error generating titles: {e}")
-        return {"title_suggestions": [state['selected_topic']], "errors": state.get('errors', []) + [str(e)]}
+        return {"title_suggestions": [state['selected_topic']], "errors": [str(e)]}
 
-def generate_outline_node(state: BloggingState, llm: ChatGroq) -> dict:
+async def generate_outline_node(state: BloggingState, llm: LLMCache) -> dict:
     """Enhanced outline generation with better structure."""
     logger.info("Generating detailed outline...")
     
-    keywords_str = ", ".join(state.get('keywords', []))
+    keywords_str = _keywords_str(state)
     
     prompt = f"""
     Create a comprehensive, well-structured outline for a {state['content_type']} about:
@@ -310,16 +594,33 @@ def generate_outline_node(state: BloggingState, llm: ChatGroq) -> dict:
     """
     
     try:
-        response = llm.invoke(prompt)
+        response = await llm.ainvoke(prompt)
         logger.info("Outline generated successfully")
         return {"outline": response.content}
         
     except Exception as e:
         logger.error(f"Error generating outline: {e}")
         return {"outline": f"# {state['selected_topic']}\n\nFailed to generate detailed outline.", 
-                "errors": state.get('errors', []) + [str(e)]}
+                "errors": [str(e)]}
+
+async def generate_titles_and_outline_node(state: BloggingState, llm: LLMCache) -> dict:
+    """Generate title suggestions and the outline concurrently.
+    
+    Both depend only on the selected topic and preferences, so the two LLM
+    round-trips overlap instead of running back to back.
+    """
+    titles, outline = await asyncio.gather(
+        generate_title_suggestions_node(state, llm),
+        generate_outline_node(state, llm)
+    )
+    
+    result = {"title_suggestions": titles["title_suggestions"], "outline": outline["outline"]}
+    errors = titles.get('errors', []) + outline.get('errors', [])
+    if errors:
+        result["errors"] = state.get('errors', []) + errors
+    return result
 
-def generate_content_node(state: BloggingState, llm: ChatGroq) -> dict:
+async def generate_content_node(state: BloggingState, llm: LLMCache) -> dict:
     """Enhanced content generation with quality controls."""
     logger.info("Generating blog content...")
     
@@ -340,7 +641,7 @@ def generate_content_node(state: BloggingState, llm: ChatGroq) -> dict:
     - Target Audience: {state['audience']}
     - Tone: {state['tone']}
     - Length: {length_guidelines.get(state['length'], 'Medium length')}
-    - Keywords to naturally incorporate: {', '.join(state.get('keywords', []))}
+    - Keywords to naturally incorporate: {_keywords_str(state)}
     
     Requirements:
     - Write in markdown format
@@ -355,8 +656,19 @@ def generate_content_node(state: BloggingState, llm: ChatGroq) -> dict:
     """
     
     try:
-        response = llm.invoke(prompt)
-        content = response.content
+        # Stream tokens so progress is visible while the article is written;
+        # regenerations ask for new content, so they bypass the cache.
+        # Running on the event loop lets Ctrl-C cancel the HTTP stream itself.
+        buffer = []
+        chars = 0
+        async for chunk in llm.astream(prompt, fresh=attempt > 1):
+            buffer.append(chunk.content)
+            chars += len(chunk.content)
+            if len(buffer) % 50 == 0:
+                UserInterface.print_progress(chars)
+        UserInterface.print_progress(chars, done=True)
+        
+        content = "".join(buffer)
         
         # Calculate metrics
         word_count = len(content.split())
@@ -368,7 +680,9 @@ def generate_content_node(state: BloggingState, llm: ChatGroq) -> dict:
             "content": content,
             "word_count": word_count,
             "estimated_read_time": read_time,
-            "generation_attempts": attempt
+            "generation_attempts": attempt,
+            "seo_score": None,  # New content needs scoring
+            "user_feedback": ""
         }
         
     except Exception as e:
@@ -378,15 +692,91 @@ def generate_content_node(state: BloggingState, llm: ChatGroq) -> dict:
             "word_count": 0,
             "estimated_read_time": 0,
             "generation_attempts": attempt,
+            "seo_score": None,  # New content needs scoring
+            "user_feedback": "",
+            "errors": state.get('errors', []) + [str(e)]
+        }
+
+async def generate_all_in_one_node(state: BloggingState, llm: LLMCache) -> dict:
+    """Generate titles, outline and content in one call for short pieces.
+    
+    For short content the three separate round-trips cost more than the
+    article itself, so a single structured-JSON prompt is used instead.
+    If the reply is not usable JSON, the run falls back to the regular
+    titles/outline/content pipeline.
+    """
+    logger.info("Generating titles, outline and content in a single call...")
+    
+    attempt = state.get('generation_attempts', 0) + 1
+    
+    prompt = f"""
+    Plan and write a short {state['content_type']} (300-600 words) about:
+    
+    Topic: "{state['selected_topic']}"
+    Target Audience: {state['audience']}
+    Tone: {state['tone']}
+    Keywords to naturally incorporate: {_keywords_str(state)}
+    
+    Return ONLY a JSON object with these keys:
+    - "titles": a list of 5 compelling, SEO-friendly titles (40-60 characters each)
+    - "outline": a markdown outline with H1, H2 and H3 headings
+    - "content": the complete article in markdown following the outline, with an
+      engaging introduction and a strong conclusion
+    
+    Do not include any meta-commentary outside the JSON object.
+    """
+    
+    try:
+        response = await llm.ainvoke(prompt, fresh=attempt > 1, response_format={"type": "json_object"})
+        
+        # Tolerate markdown fences or stray text around the JSON object
+        match = _JSON_OBJECT.search(response.content)
+        data = orjson.loads(match.group(0) if match else response.content)
+        
+        if not isinstance(data, dict):
+            raise ValueError("Reply is not a JSON object")
+        content, outline = data.get('content'), data.get('outline')
+        if not (isinstance(content, str) and content.strip() and isinstance(outline, str) and outline.strip()):
+            raise ValueError("Reply is missing the content or outline")
+        
+        titles = data.get('titles')
+        if not isinstance(titles, list):
+            titles = []
+        titles = [str(title) for title in titles if title] or [state['selected_topic']]
+        
+        word_count = len(content.split())
+        read_time = max(1, word_count // 200)  # Assume 200 WPM reading speed
+        
+        logger.info(f"Content generated: {word_count} words, ~{read_time} min read")
+        
+        return {
+            "title_suggestions": titles,
+            "outline": outline,
+            "content": content,
+            "word_count": word_count,
+            "estimated_read_time": read_time,
+            "generation_attempts": attempt,
+            "seo_score": None,  # New content needs scoring
+            "user_feedback": ""
+        }
+        
+    except Exception as e:
+        # Malformed or truncated JSON: let the regular pipeline write the piece
+        logger.warning(f"All-in-one generation failed, falling back to the full pipeline: {e}")
+        return {
+            "all_in_one_failed": True,
             "errors": state.get('errors', []) + [str(e)]
         }
 
 def content_optimization_node(state: BloggingState) -> dict:
     """Enhanced content optimization with multiple quality metrics."""
+    if state.get('seo_score') is not None:
+        logger.info("Content already optimized - skipping")
+        return {}
+    
     logger.info("Optimizing content for SEO and readability...")
     
     content = state['content']
-    analyzer = ContentAnalyzer()
     
     # Ensure proper title format
     if not content.strip().startswith("# "):
@@ -396,15 +786,16 @@ def content_optimization_node(state: BloggingState) -> dict:
             title = title.split('.', 1)[1].strip()
         content = f"# {title}\n\n{content}"
     
-    # Calculate quality scores
-    seo_score = analyzer.calculate_seo_score(
+    # Calculate quality scores in a single analysis pass
+    scores = ContentAnalyzer.analyze(
         content, 
         state['selected_topic'], 
-        state.get('keywords', [])
+        state.get('keywords', []),
+        state['outline']
     )
-    
-    readability_score = analyzer.calculate_readability_score(content)
-    quality_score = analyzer.calculate_content_quality_score(content, state['outline'])
+    seo_score = scores["seo"]
+    readability_score = scores["readability"]
+    quality_score = scores["quality"]
     
     logger.info(f"Optimization complete - SEO: {seo_score}, Readability: {readability_score}, Quality: {quality_score}")
     
@@ -415,29 +806,33 @@ def content_optimization_node(state: BloggingState) -> dict:
         "content_quality_score": quality_score
     }
 
-# --- 6. Enhanced Conditional Logic ---
-def decide_workflow_path(state: BloggingState) -> str:
-    """Enhanced decision logic for workflow control."""
-    logger.info("Evaluating workflow path...")
-    
-    feedback = state.get("user_feedback", "").lower().strip()
-    attempts = state.get("generation_attempts", 0)
-    
-    if feedback == "approve":
-        logger.info("User approved content - finishing workflow")
-        return "end"
-    elif attempts >= 3:
-        logger.info("Maximum attempts reached - finishing workflow")
-        return "end"
-    elif feedback in ["regenerate", "revise", "improve"]:
-        logger.info("User requested regeneration")
-        return "regenerate"
-    else:
-        logger.info("User provided feedback - regenerating with improvements")
-        return "regenerate"
-
-# --- 7. Enhanced User Interface ---
+# --- 7. Enhanced Conditional Logic ---
+def route_entry(state: BloggingState) -> str:
+    """Pick the entry node for a workflow run."""
+    if not state.get("selected_topic"):
+        return "fetch_topics"
+    if state.get("content"):
+        # Regeneration: titles and outline are already in state
+        return "generate_content"
+    if state.get("length") == "Short":
+        return "generate_all_in_one"
+    return "generate_titles_and_outline"
+
+def route_after_all_in_one(state: BloggingState) -> str:
+    """Fall back to the regular pipeline when the single-call reply was unusable."""
+    if state.get("all_in_one_failed"):
+        return "generate_titles_and_outline"
+    return "optimize_content"
+
+_APPROVE = frozenset({"approve", "yes", "y", "ok", "looks good"})
+
+# --- 8. Enhanced User Interface ---
 class UserInterface:
+    @staticmethod
+    def print_progress(chars: int, done: bool = False):
+        """Show streaming progress on a single console line."""
+        print(f"\r✍️ Writing content... {chars:,} characters", end="\n" if done else "", flush=True)
+    
     @staticmethod
     def display_topics(topics: List[dict]):
         """Display topics in a formatted way."""
@@ -520,36 +915,47 @@ def save_content_to_file(state: BloggingState) -> str:
         output_dir.mkdir(exist_ok=True)
         
         # Generate filename
-        topic_slug = re.sub(r'[^\w\s-]', '', state['selected_topic'])
-        topic_slug = re.sub(r'[-\s]+', '-', topic_slug).strip('-').lower()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        topic = state['selected_topic']
+        now = datetime.now()
+        topic_slug = _SLUG_STRIP.sub('', topic)
+        topic_slug = _SLUG_DASH.sub('-', topic_slug).strip('-').lower()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename = f"{topic_slug}_{timestamp}.md"
         
         filepath = output_dir / filename
         
+        # Pull state fields once
+        get = state.get
+        keywords = get('keywords', [])
+        word_count = get('word_count', 0)
+        read_time = get('estimated_read_time', 0)
+        seo_score = get('seo_score', 0)
+        readability_score = get('readability_score', 0)
+        quality_score = get('content_quality_score', 0)
+        created_at = get('created_at') or now.isoformat()
+        
         # Prepare content with metadata
         metadata = f"""---
-title: "{state['selected_topic']}"
+title: "{topic}"
 audience: "{state['audience']}"
 tone: "{state['tone']}"
 length: "{state['length']}"
 content_type: "{state['content_type']}"
-keywords: {state.get('keywords', [])}
-word_count: {state.get('word_count', 0)}
-read_time: {state.get('estimated_read_time', 0)}
-seo_score: {state.get('seo_score', 0)}
-readability_score: {state.get('readability_score', 0)}
-quality_score: {state.get('content_quality_score', 0)}
-created_at: "{state.get('created_at', datetime.now().isoformat())}"
+keywords: {keywords}
+word_count: {word_count}
+read_time: {read_time}
+seo_score: {seo_score}
+readability_score: {readability_score}
+quality_score: {quality_score}
+created_at: "{created_at}"
 ---
 
 """
         
-        full_content = metadata + state.get('optimized_content', '')
-        
-        # Write to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(full_content)
+        # Write metadata and content separately to avoid concatenating a copy
+        with open(filepath, 'w', encoding='utf-8', buffering=io.DEFAULT_BUFFER_SIZE * 4) as f:
+            f.write(metadata)
+            f.write(state.get('optimized_content', ''))
         
         logger.info(f"Content saved to {filepath}")
         return str(filepath)
@@ -558,50 +964,99 @@ created_at: "{state.get('created_at', datetime.now().isoformat())}"
         logger.error(f"Error saving content: {e}")
         return ""
 
-# --- 8. Main Application ---
+# --- 9. Main Application ---
 class BloggingAgent:
     def __init__(self):
-        self.config = BloggingConfig()
+        self.config = get_config()
         self.llm = ChatGroq(
             temperature=self.config.temperature,
             model_name=self.config.model_name,
             max_tokens=self.config.max_tokens
         )
+        self.fetcher = get_topic_fetcher(self.config)
+        self.cached_llm = LLMCache(self.llm, self.config)
         self.ui = UserInterface()
-        self.workflow = self._build_workflow()
+        # One loop for every workflow run: the ChatGroq clients keep async
+        # connection pools that only work on the loop that opened them
+        self._loop = asyncio.new_event_loop()
+        self.workflow = self._compiled_workflow(
+            (self.config.model_name, self.config.temperature, self.config.max_tokens)
+        )
+        
+        # Clients are injected per run so the compiled graph can be shared
+        self.run_config = {
+            "configurable": {
+                "fetcher": self.fetcher,
+                "llm": self.cached_llm
+            }
+        }
     
-    def _build_workflow(self) -> StateGraph:
-        """Build the enhanced workflow graph."""
+    @classmethod
+    @functools.lru_cache(maxsize=4)
+    def _compiled_workflow(cls, key: tuple) -> StateGraph:
+        """Build the enhanced workflow graph, compiled once per model settings."""
         workflow = StateGraph(BloggingState)
         
+        def fetch_topics(state, config: RunnableConfig):
+            return fetch_trending_topics_node(state, config["configurable"]["fetcher"])
+        
+        async def generate_titles_and_outline(state, config: RunnableConfig):
+            return await generate_titles_and_outline_node(state, config["configurable"]["llm"])
+        
+        async def generate_all_in_one(state, config: RunnableConfig):
+            return await generate_all_in_one_node(state, config["configurable"]["llm"])
+        
+        async def generate_content(state, config: RunnableConfig):
+            return await generate_content_node(state, config["configurable"]["llm"])
+        
         # Add nodes
-        workflow.add_node("fetch_topics", fetch_trending_topics_node)
-        workflow.add_node("generate_titles", lambda state: generate_title_suggestions_node(state, self.llm))
-        workflow.add_node("generate_outline", lambda state: generate_outline_node(state, self.llm))
-        workflow.add_node("generate_content", lambda state: generate_content_node(state, self.llm))
+        workflow.add_node("fetch_topics", fetch_topics)
+        workflow.add_node("generate_titles_and_outline", generate_titles_and_outline)
+        workflow.add_node("generate_all_in_one", generate_all_in_one)
+        workflow.add_node("generate_content", generate_content)
         workflow.add_node("optimize_content", content_optimization_node)
         
-        # Set entry point
-        workflow.set_entry_point("fetch_topics")
+        # Set entry point: topic fetching, the short-content fast path,
+        # or the regular titles/outline/content pipeline
+        workflow.set_conditional_entry_point(
+            route_entry,
+            {
+                "fetch_topics": "fetch_topics",
+                "generate_all_in_one": "generate_all_in_one",
+                "generate_titles_and_outline": "generate_titles_and_outline",
+                "generate_content": "generate_content"
+            }
+        )
         
         # Add edges
-        workflow.add_edge("fetch_topics", "generate_titles")
-        workflow.add_edge("generate_titles", "generate_outline")
-        workflow.add_edge("generate_outline", "generate_content")
-        workflow.add_edge("generate_content", "optimize_content")
-        
-        # Add conditional edge for regeneration
+        workflow.add_edge("fetch_topics", END)
+        workflow.add_edge("generate_titles_and_outline", "generate_content")
         workflow.add_conditional_edges(
-            "optimize_content",
-            decide_workflow_path,
+            "generate_all_in_one",
+            route_after_all_in_one,
             {
-                "regenerate": "generate_content",
-                "end": END
+                "generate_titles_and_outline": "generate_titles_and_outline",
+                "optimize_content": "optimize_content"
             }
         )
+        workflow.add_edge("generate_content", "optimize_content")
+        
+        # Each run stops for the user's review; run() drives regeneration
+        workflow.add_edge("optimize_content", END)
         
         return workflow.compile()
     
+    def _run_workflow(self, state: dict) -> dict:
+        """Run the workflow graph to completion on the agent's event loop."""
+        task = self._loop.create_task(self.workflow.ainvoke(state, config=self.run_config))
+        try:
+            return self._loop.run_until_complete(task)
+        except KeyboardInterrupt:
+            # Cancel the run so the in-flight HTTP stream is closed, not abandoned
+            task.cancel()
+            self._loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+            raise
+    
     def run(self):
         """Main execution method."""
         print("🚀 Welcome to the Enhanced AI Blogging Agent!")
@@ -610,7 +1065,7 @@ class BloggingAgent:
         try:
             # Stage 1: Fetch topics
             logger.info("Starting topic fetching phase")
-            initial_state = self.workflow.invoke({})
+            initial_state = self._run_workflow({})
             
             if not initial_state.get('trending_topics'):
                 print("❌ Could not fetch topics. Please check your internet connection and try again.")
@@ -649,7 +1104,7 @@ class BloggingAgent:
                 print(f"\n🔄 Starting content generation (Attempt {generation_state.get('generation_attempts', 0) + 1})")
                 
                 # Generate content
-                final_state = self.workflow.invoke(generation_state)
+                final_state = self._run_workflow(generation_state)
                 
                 # Display results
                 self.ui.display_content_summary(final_state)
@@ -663,7 +1118,7 @@ class BloggingAgent:
                 
                 feedback = input("\n💭 Your feedback: ").strip()
                 
-                if feedback.lower() == 'approve':
+                if feedback.lower() in _APPROVE:
                     # Save content
                     filepath = save_content_to_file(final_state)
                     print(f"\n🎉 Content approved and saved!")
@@ -697,9 +1152,12 @@ class BloggingAgent:
             logger.error(f"Application error: {e}")
         
         finally:
+            self.fetcher.shutdown()
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
             print("\n👋 Thank you for using the AI Blogging Agent!")
 
-# --- 9. Entry Point ---
+# --- 10. Entry Point ---
 if __name__ == "__main__":
     agent = BloggingAgent()
     agent.run()
\ No newline at end of file
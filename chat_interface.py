@@ -1,31 +1,46 @@
 """
 Chat interface functionality for the Wikipedia AI app
 """
+import importlib
+import textwrap
+import threading
 import streamlit as st
-from langchain_rag import populate_vector_store, setup_rag_chain
 from styling import create_icon_header
+# langchain_rag pulls in LangChain, Chroma and ONNX Runtime; it is imported on first use
 
 
-def display_chat_message(role, content):
-    """Display a chat message with proper styling"""
-    if role == "user":
-        st.markdown(f"""
-        <div class="chat-message user">
-            <div class="avatar">
-                <i class="fas fa-user"></i>
-            </div>
-            <div class="message-content">{content}</div>
+@st.cache_resource
+def warm_up_chat_backend():
+    """Start importing the RAG stack in the background so it overlaps with the first scrape"""
+    thread = threading.Thread(target=importlib.import_module, args=("langchain_rag",), daemon=True)
+    thread.start()
+    return thread
+
+
+# Dedented once, before formatting: Streamlit dedents the whole markdown body, and
+# indented tags following a blank line inside an answer would render as a code block
+_MESSAGE_HTML = textwrap.dedent("""
+    <div class="chat-message {role}">
+        <div class="avatar">
+            <i class="fas {icon}"></i>
         </div>
-        """, unsafe_allow_html=True)
+        <div class="message-content">{content}</div>
+    </div>
+""").strip()
+
+
+def _render_message(role, content):
+    """Return the styled HTML for a chat message"""
+    if role == "user":
+        return _MESSAGE_HTML.format(role="user", icon="fa-user", content=content)
     else:
-        st.markdown(f"""
-        <div class="chat-message assistant">
-            <div class="avatar">
-                <i class="fas fa-robot"></i>
-            </div>
-            <div class="message-content">{content}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        return _MESSAGE_HTML.format(role="assistant", icon="fa-robot", content=content)
+
+
+def _render_transcript(messages):
+    """Return the styled HTML for the whole chat history"""
+    # Newline-joined, no blank lines between messages, so each one starts a fresh HTML block
+    return "\n".join(_render_message(message["role"], message["content"]) for message in messages)
 
 
 def initialize_chat_session():
@@ -40,6 +55,8 @@ def initialize_chat_session():
 
 def setup_chat_system(text_content, page_name):
     """Setup the RAG system for chat functionality"""
+    from langchain_rag import populate_vector_store, setup_rag_chain
+    
     try:
         with st.spinner("Setting up AI chat system..."):
             # Just clear the chain, keep vector store for reuse
@@ -64,11 +81,13 @@ def handle_chat_interaction():
     """Handle the chat interface and interactions"""
     st.markdown(create_icon_header("fas fa-comments", "Chat with Wikipedia Content"), unsafe_allow_html=True)
     
-    # Display chat history
+    # Display chat history in a placeholder that is updated in place
     chat_container = st.container()
     with chat_container:
-        for message in st.session_state.chat_messages:
-            display_chat_message(message["role"], message["content"])
+        transcript = st.empty()
+        transcript.markdown(_render_transcript(st.session_state.chat_messages), unsafe_allow_html=True)
+        # The in-flight question and answer stream here, so tokens don't resend the history
+        pending = st.empty()
     
     # Chat input
     st.markdown("---")
@@ -92,10 +111,24 @@ def handle_chat_interaction():
             "role": "user", 
             "content": user_question
         })
+        question_html = _render_message("user", user_question)
+        pending.markdown(question_html, unsafe_allow_html=True)
+        
+        # Stream the answer under the question
+        from langchain_rag import TokenStreamHandler
+        stream_handler = TokenStreamHandler(
+            lambda answer: pending.markdown(
+                question_html + "\n" + _render_message("assistant", answer),
+                unsafe_allow_html=True
+            )
+        )
         
         with st.spinner("🤖 AI is thinking..."):
             try:
-                result = st.session_state.qa_chain.invoke({"query": user_question})
+                result = st.session_state.qa_chain.invoke(
+                    {"query": user_question},
+                    config={"callbacks": [stream_handler]}
+                )
                 ai_response = result["result"]
                 
                 st.session_state.chat_messages.append({
@@ -103,22 +136,24 @@ def handle_chat_interaction():
                     "content": ai_response
                 })
                 
-                # Rerun to update the display
-                st.rerun()
-                
             except Exception as e:
                 error_message = f"Sorry, I encountered an error: {str(e)}"
                 st.session_state.chat_messages.append({
                     "role": "assistant", 
                     "content": error_message
                 })
-                st.rerun()
+        
+        # Fold the finished turn into the transcript once
+        transcript.markdown(_render_transcript(st.session_state.chat_messages), unsafe_allow_html=True)
+        pending.empty()
     
     elif send_clicked and not user_question.strip():
         st.warning("⚠️ Please enter a question before sending!")
 
-    # Clear chat button
+    # Clear chat button, in its own slot so it disappears along with the history
     if st.session_state.chat_messages:
-        if st.button("🗑️ Clear Chat History"):
+        clear_slot = st.empty()
+        if clear_slot.button("🗑️ Clear Chat History"):
             st.session_state.chat_messages = []
-            st.rerun()
\ No newline at end of file
+            transcript.empty()
+            clear_slot.empty()
\ No newline at end of file
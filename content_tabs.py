@@ -18,7 +18,7 @@ def create_content_tabs(text_content, page_name):
         _handle_content_tab(text_content)
     
     with tab3:
-        _handle_download_tab(text_content, page_name)
+        _handle_download_tab()
 
 
 def _handle_chat_tab():
@@ -48,14 +48,9 @@ def _handle_content_tab(text_content):
     
     # Display text based on option
     if "Preview" in st.session_state.display_option:
-        words = text_content.split()
-        preview_text = ' '.join(words[:500])
-        if len(words) > 500:
-            preview_text += "..."
-        
         st.text_area(
             "Content Preview:",
-            preview_text,
+            st.session_state.preview_text,
             height=300,
             disabled=True
         )
@@ -68,18 +63,15 @@ def _handle_content_tab(text_content):
         )
 
 
-def _handle_download_tab(text_content, page_name):
+def _handle_download_tab():
     """Handle the download tab content"""
     st.markdown(create_icon_header("fas fa-cloud-download-alt", "Download Options"), unsafe_allow_html=True)
     
-    # Prepare filename
-    filename = f"{page_name.replace(' ', '_')}_wikipedia.txt"
-    
-    # Download button with icon
+    # Download button with icon; payload and filename are prepared at scrape time
     st.download_button(
         label="📥 Download Text File",
-        data=text_content,
-        file_name=filename,
+        data=st.session_state.download_bytes,
+        file_name=st.session_state.download_filename,
         mime="text/plain",
         help="Download the scraped text as a .txt file"
     )
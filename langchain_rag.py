@@ -4,19 +4,23 @@ RAG model for chat functionality with Wikipedia scraped content.
 from langchain.chains import RetrievalQA
 from langchain_groq import ChatGroq  
 from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain.prompts import PromptTemplate
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from scraper import scrape_wikipedia
+from scraper import load_or_scrape_wikipedia, get_topic_key
 from langchain.schema import Document
+from langchain_core.callbacks import BaseCallbackHandler
+from onnx_embeddings import OnnxMiniLMEmbeddings
 from dotenv import load_dotenv
+import chromadb
+import hashlib
 import os
+import re
+from bisect import bisect_left, bisect_right
 import streamlit as st
 
 @st.cache_resource
 def get_cached_embeddings():
-    """Load embeddings model once and reuse it"""
-    return HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    """Load the INT8-quantized ONNX embeddings model once and reuse it"""
+    return OnnxMiniLMEmbeddings()
 
 # Converting the scraped text to document object
 def convert_text_to_documents(text, topic_name):
@@ -34,57 +38,112 @@ def convert_text_to_documents(text, topic_name):
         documents.append(doc)
     return documents
 
+# Sentence ends and paragraph breaks where chunks may be cut
+_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+|\n\n+")
+
 # Function to split text into manageable chunks
 def split_text(text, chunk_size=1000, chunk_overlap=200):
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        length_function=len
-    )
-    return text_splitter.split_text(text)
+    """Pack sentences into windows of at most chunk_size chars, overlapping by up to chunk_overlap"""
+    length = len(text)
+    bounds = [0, *(match.end() for match in _BOUNDARY_RE.finditer(text)), length]
+    
+    chunks = []
+    start = end = 0
+    while start < length:
+        # Cut at the furthest boundary that fits; hard-cut when that would not
+        # get past the previous chunk (a sentence longer than the window)
+        i = bisect_right(bounds, start + chunk_size) - 1
+        end = bounds[i] if bounds[i] > end else min(start + chunk_size, length)
+        
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= length:
+            break
+        
+        # Start the next window at the first boundary inside the overlap region
+        j = bisect_left(bounds, end - chunk_overlap)
+        start = bounds[j] if start < bounds[j] < end else max(end - chunk_overlap, start + 1)
+    
+    return chunks
+
+@st.cache_resource
+def get_chroma_client():
+    """Open the Chroma database once and share it across topics"""
+    return chromadb.PersistentClient(path="chroma_db")
+
+# Chroma collection names allow 3-63 chars of [a-zA-Z0-9._-], alphanumeric at both ends
+def get_collection_name(topic_name):
+    topic_key = get_topic_key(topic_name)
+    name = re.sub(r'[^a-zA-Z0-9._-]', '_', topic_key).strip('._-')[:54]
+    digest = hashlib.sha1(topic_key.encode("utf-8")).hexdigest()[:8]
+    return f"{name}-{digest}" if name else f"topic-{digest}"
 
 def setup_vector_store(topic_name):
     embeddings = get_cached_embeddings()  
-    topic_key = topic_name.lower().replace(' ', '_')
-    persist_dir = f"chroma_db/{topic_key}"  
     vector_store = Chroma(
-        embedding_function=embeddings, 
-        persist_directory=persist_dir
+        client=get_chroma_client(),
+        collection_name=get_collection_name(topic_name),
+        embedding_function=embeddings,
+        # Embeddings are L2-normalized, so cosine distance reduces to a dot product
+        collection_metadata={"hnsw:space": "cosine"}
     )
     return vector_store
 
 def populate_vector_store(text, topic_name):
     vector_store = setup_vector_store(topic_name)
     
-    # Check if data already exists
+    # Check if data already exists without materializing the collection
     try:
-        existing = vector_store.get()
-        if existing['ids']:  # Data exists, reuse it
+        if vector_store._collection.count() > 0:  # Data exists, reuse it
             return vector_store
-    except:
+    except Exception:
         pass  # No existing data, create new
     
-    # Create new data
+    # Create new data, embedding the chunks in concurrent sub-batches
     documents = convert_text_to_documents(text, topic_name)
-    vector_store.add_documents(documents)
+    texts = [doc.page_content for doc in documents]
+    embeddings = get_cached_embeddings().embed_batched(texts)
+    
+    topic_key = get_topic_key(topic_name)
+    vector_store._collection.add(
+        ids=[f"{topic_key}-{i}" for i in range(len(texts))],
+        embeddings=embeddings.tolist(),
+        documents=texts,
+        metadatas=[doc.metadata for doc in documents]
+    )
     return vector_store
 
-def setup_rag_chain(vector_store):
+class TokenStreamHandler(BaseCallbackHandler):
+    """Pass the answer generated so far to on_text every time the LLM emits a token"""
+
+    def __init__(self, on_text):
+        self.on_text = on_text
+        self.text = ""
+
+    def on_llm_new_token(self, token, **kwargs):
+        self.text += token
+        self.on_text(self.text)
+
+@st.cache_resource
+def get_groq_client():
+    """Create the Groq chat client once and share it across topics"""
     # Load environment variables again to be sure
     load_dotenv()
     
     # Get API key
     api_key = os.getenv("GROQ_API_KEY") or st.secrets.get("GROQ_API_KEY", None)
     
-    try:
-        # Initialize the Groq client with explicit API key
-        client = ChatGroq(
-            api_key=api_key,  
-            model_name="llama-3.3-70b-versatile",  
-            temperature=0.7,
-        )
-    except Exception as e:
-        raise
+    # Initialize the Groq client with explicit API key
+    return ChatGroq(
+        api_key=api_key,  
+        model_name="llama-3.3-70b-versatile",  
+        temperature=0.7,
+        streaming=True,
+    )
+
+def setup_rag_chain(vector_store):
+    client = get_groq_client()
 
     # Define the prompt template
     prompt_template = PromptTemplate(
@@ -106,7 +165,11 @@ def setup_rag_chain(vector_store):
     qa_chain = RetrievalQA.from_chain_type(
         llm=client,
         chain_type="stuff",
-        retriever=vector_store.as_retriever(search_kwargs={"k": 3}),
+        # MMR drops near-duplicate paragraphs so the prompt carries less redundant context
+        retriever=vector_store.as_retriever(
+            search_type="mmr",
+            search_kwargs={"k": 3, "fetch_k": 12, "lambda_mult": 0.5}
+        ),
         chain_type_kwargs={"prompt": prompt_template},
         return_source_documents=True
     )
@@ -114,8 +177,8 @@ def setup_rag_chain(vector_store):
     return qa_chain
 
 def ask_question_langchain(topic, question):
-    # Scrape Wikipedia content
-    content = scrape_wikipedia(topic)
+    # Load cached or freshly scraped Wikipedia content
+    content = load_or_scrape_wikipedia(topic)
     if not content:
         return "Sorry, couldn't find information about that topic."
     
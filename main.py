@@ -1,7 +1,8 @@
 """fast api for this app"""
+import asyncio
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from scraper import scrape_wikipedia
+from scraper import scrape_wikipedia_async
 from pydantic import BaseModel, Field
 
 app = FastAPI()
@@ -44,7 +45,7 @@ async def scrape(topic: ScrapeRequest):
     Scrape a Wikipedia page for the given topic.
     """
     try:
-        content = scrape_wikipedia(topic.topic)
+        content = await scrape_wikipedia_async(topic.topic)
         if not content:
             raise HTTPException(status_code=404, detail="Topic not found or no content available.")
         
@@ -63,7 +64,7 @@ async def chat_with_wikipedia(request: ChatRequest):
     """
     try:
         from langchain_rag import ask_question_langchain  
-        answer = ask_question_langchain(request.topic, request.question)
+        answer = await asyncio.to_thread(ask_question_langchain, request.topic, request.question)
         
         return ChatResponse(
             topic=request.topic,
@@ -0,0 +1,99 @@
+"""
+INT8-quantized MiniLM sentence embeddings served with ONNX Runtime
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+import onnxruntime as ort
+import psutil
+from transformers import AutoTokenizer
+from langchain_core.embeddings import Embeddings
+
+MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+MODEL_DIR = Path("models/all-MiniLM-L6-v2-int8")
+OPTIMIZED_FILE = "model_optimized.onnx"
+QUANTIZED_FILE = "model_optimized_quantized.onnx"
+
+
+def export_quantized_model(model_dir=MODEL_DIR):
+    """Export MiniLM to ONNX, fuse the graph (O3) and apply dynamic INT8 quantization (AVX-512 VNNI)"""
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTOptimizer, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoOptimizationConfig, AutoQuantizationConfig
+
+    model_dir = Path(model_dir)
+    model = ORTModelForFeatureExtraction.from_pretrained(MODEL_ID, export=True)
+
+    # Fuse attention, LayerNorm and GELU; O4 adds fp16 and is GPU-only
+    optimizer = ORTOptimizer.from_pretrained(model)
+    optimizer.optimize(save_dir=model_dir, optimization_config=AutoOptimizationConfig.O3())
+
+    quantizer = ORTQuantizer.from_pretrained(model_dir, file_name=OPTIMIZED_FILE)
+    quantizer.quantize(
+        save_dir=model_dir,
+        quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    )
+    AutoTokenizer.from_pretrained(MODEL_ID).save_pretrained(model_dir)
+
+    # Only the quantized graph is loaded; drop the ~90 MB FP32 intermediate
+    (model_dir / OPTIMIZED_FILE).unlink(missing_ok=True)
+
+
+class OnnxMiniLMEmbeddings(Embeddings):
+    """LangChain embeddings backed by the quantized MiniLM ONNX model"""
+
+    def __init__(self, model_dir=MODEL_DIR, max_length=256, batch_size=32):
+        model_dir = Path(model_dir)
+        if not (model_dir / QUANTIZED_FILE).exists():
+            export_quantized_model(model_dir)
+
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Physical cores only: hyperthread siblings share the vector units the INT8 MatMuls run on
+        session_options.intra_op_num_threads = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+        session_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        # Reuse tensor buffers across session.run calls instead of allocating per batch
+        session_options.enable_mem_pattern = True
+        session_options.enable_cpu_mem_arena = True
+        self.session = ort.InferenceSession(
+            str(model_dir / QUANTIZED_FILE),
+            session_options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+        # Two workers: one sub-batch tokenizes while the other runs (ORT releases the GIL)
+        self.executor = ThreadPoolExecutor(max_workers=2)
+
+    def embed(self, texts):
+        """Embed a batch of texts in one forward pass, returning L2-normalized vectors"""
+        inputs = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np"
+        )
+        feed = {name: inputs[name].astype(np.int64) for name in self.input_names}
+        token_embeddings = self.session.run(None, feed)[0]
+
+        # Mean pooling over real tokens, then normalize like sentence-transformers does
+        mask = inputs["attention_mask"][..., np.newaxis].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def embed_batched(self, texts):
+        """Embed texts in sub-batches run concurrently; each pads only to its own longest text"""
+        texts = list(texts)
+        if len(texts) <= self.batch_size:
+            return self.embed(texts)
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        return np.vstack(list(self.executor.map(self.embed, batches)))
+
+    def embed_documents(self, texts):
+        return self.embed_batched(texts).tolist()
+
+    def embed_query(self, text):
+        return self.embed([text])[0].tolist()
@@ -50,5 +50,11 @@ def initialize_session_state():
         st.session_state.current_content = None
     if 'current_page' not in st.session_state:
         st.session_state.current_page = None
+    if 'preview_text' not in st.session_state:
+        st.session_state.preview_text = None
+    if 'download_bytes' not in st.session_state:
+        st.session_state.download_bytes = None
+    if 'download_filename' not in st.session_state:
+        st.session_state.download_filename = None
     if 'show_results' not in st.session_state:
         st.session_state.show_results = False
\ No newline at end of file
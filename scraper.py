@@ -1,11 +1,27 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import aiohttp
+from selectolax.parser import HTMLParser
 import re
 import streamlit as st
+from pathlib import Path
 
-@st.cache_data  
+CACHE_DIR = Path("cache")
 
-def scrape_wikipedia(topic):
+
+def _extract_text(html):
+    """Pull the paragraph text out of a Wikipedia page and clean it up"""
+    tree = HTMLParser(html)
+    
+    # Extract text from paragraphs
+    corpus = ''.join(p.text() + '\n' for p in tree.css('p'))
+    
+    # Clean the text more efficiently
+    corpus = re.sub(r'\[\d+\]', '', corpus)  # Remove citations
+    corpus = re.sub(r'\n\s*\n', '\n\n', corpus)  # Clean spacing
+    return corpus.strip()
+
+
+async def scrape_wikipedia_async(topic):
     formatted_topic = topic.replace(' ', '_')
     wiki_url = f'https://en.wikipedia.org/wiki/{formatted_topic}'
     
@@ -14,24 +30,40 @@ def scrape_wikipedia(topic):
     }
     
     try:
-        res = requests.get(wiki_url, headers=headers)
-        if res.status_code == 404:
-            print("Article not found. Try a different topic.")
-            return None
-            
-        soup = BeautifulSoup(res.text, 'html.parser')
-        
-        # Extract text from paragraphs
-        corpus = ''
-        for p in soup.find_all('p'):
-            corpus += p.get_text() + '\n'
+        async with aiohttp.ClientSession(headers=headers) as session:
+            async with session.get(wiki_url) as res:
+                if res.status == 404:
+                    print("Article not found. Try a different topic.")
+                    return None
+                html = await res.text()
         
-        # Clean the text more efficiently
-        corpus = re.sub(r'\[\d+\]', '', corpus)  # Remove citations
-        corpus = re.sub(r'\n\s*\n', '\n\n', corpus)  # Clean spacing
-        corpus = corpus.strip()
-        
-        return corpus
+        # Parsing is CPU-bound, keep it off the event loop
+        return await asyncio.to_thread(_extract_text, html)
         
     except Exception as e:
         raise RuntimeError(f"Failed to scrape Wikipedia: {e}")
+
+
+@st.cache_data  
+
+def scrape_wikipedia(topic):
+    """Blocking wrapper around scrape_wikipedia_async for Streamlit"""
+    return asyncio.run(scrape_wikipedia_async(topic))
+
+
+def get_topic_key(topic):
+    return topic.lower().replace(' ', '_')
+
+
+def load_or_scrape_wikipedia(topic):
+    """Return the page text from the on-disk cache, scraping and caching it on a miss"""
+    filename = re.sub(r'[^\w.-]', '_', get_topic_key(topic))
+    path = CACHE_DIR / f"{filename}.txt"
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+    
+    text = scrape_wikipedia(topic)
+    if text:
+        CACHE_DIR.mkdir(exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    return text
@@ -2,9 +2,8 @@
 Handles the scraping functionality and user input
 """
 import streamlit as st
-from scraper import scrape_wikipedia
 from styling import create_icon_header
-from chat_interface import setup_chat_system
+from chat_interface import setup_chat_system, warm_up_chat_backend
 
 
 def create_scraping_interface():
@@ -34,9 +33,12 @@ def handle_scraping(page_name, scrape_clicked):
     """Handle the scraping process and setup"""
     if scrape_clicked:
         if page_name:
+            from scraper import load_or_scrape_wikipedia
+            warm_up_chat_backend()
+            
             # Show loading spinner
             with st.spinner(f"🔄 Scraping Wikipedia page: {page_name}..."):
-                text_content = scrape_wikipedia(page_name)
+                text_content = load_or_scrape_wikipedia(page_name)
             
             if text_content is None:
                 st.error(f"❌ Error: Could not find or scrape the page '{page_name}'. Please check the page name and try again.")
@@ -49,6 +51,14 @@ def handle_scraping(page_name, scrape_clicked):
                 st.session_state.current_page = page_name
                 st.session_state.show_results = True
                 
+                # Build the preview once instead of re-splitting on every rerun
+                words = text_content.split()
+                st.session_state.preview_text = ' '.join(words[:500]) + ("..." if len(words) > 500 else "")
+                
+                # Encode the download payload once instead of on every rerun
+                st.session_state.download_bytes = text_content.encode("utf-8")
+                st.session_state.download_filename = f"{page_name.replace(' ', '_')}_wikipedia.txt"
+                
                 # Setup chat system
                 chat_ready = setup_chat_system(text_content, page_name)
                 if chat_ready:
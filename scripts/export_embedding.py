@@ -0,0 +1,17 @@
+"""
+Export the optimized, INT8-quantized MiniLM model used for chat embeddings.
+
+Run once from the repository root so the app skips the export on first use:
+    python scripts/export_embedding.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from onnx_embeddings import MODEL_DIR, export_quantized_model
+
+
+if __name__ == "__main__":
+    export_quantized_model(MODEL_DIR)
+    print(f"Embedding model saved to {MODEL_DIR}")
@@ -1,12 +1,10 @@
 import streamlit as st
 
-def apply_dark_theme():
-    """Apply custom dark theme styling with Font Awesome support"""
-    st.markdown("""
+# Font Awesome is linked rather than @import-ed so the browser can fetch it in
+# parallel and cache it; the whole payload is built once at import time
+_DARK_THEME_CSS = """
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
     <style>
-    /* Font Awesome CDN Import */
-    @import url('https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css');
-    
     /* Main app background */
     .stApp {
         background-color: #000000 !important;
@@ -223,7 +221,13 @@ def apply_dark_theme():
         border-top: 1px solid #434343;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+def apply_dark_theme():
+    """Apply custom dark theme styling with Font Awesome support"""
+    # Streamlit drops elements a rerun does not emit, so this runs every rerun
+    st.markdown(_DARK_THEME_CSS, unsafe_allow_html=True)
 
 def create_icon_header(icon_class, text):
     """Create a header with an icon"""